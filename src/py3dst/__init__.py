@@ -1,4 +1,9 @@
 __version__ = "1.2.1"
 
 from .tex3dst import Texture3dst
-from .error_classes import Texture3dstException, Texture3dstNoSignature, Texture3dstUnsupported
\ No newline at end of file
+from .verify import verify, verifyFiles
+from .compare import compare, compareFiles
+from .shared import SharedTexture3dst
+from .output import ImageOutput
+from .report import BatchReport
+from .error_classes import Texture3dstException, Texture3dstNoSignature, Texture3dstUnsupported, Texture3dstReadOnly
\ No newline at end of file
@@ -1,25 +1,89 @@
 import argparse
 import sys
+import contextlib
 import os
+import json
+import time
 import tkinter
 import traceback
+import zipfile
 from PIL import Image, ImageTk, UnidentifiedImageError
 from glob import iglob
 from pathlib import Path
+from typing import BinaryIO, List, Tuple
 from .tex3dst import Texture3dst
+from .dedup import Deduplicator
+from .output import ImageOutput, IMAGE_FORMATS, PNG_STRATEGIES
+from .report import BatchReport
+from .archive import ARCHIVE_SEPARATOR, splitArchivePath, isArchive, iterArchiveMembers
+from .verify import verifyFiles
+from .compare import compareFiles
 from .error_classes import *
 
 __version__ = "1.2.1"
 
-def convertFile(input_path: Path, output_path: Path, show_unidentified_image: bool, show_tracebacks: bool):
+def openOutputFile(output_path: Path, output_archive: zipfile.ZipFile, name: str) -> Tuple[BinaryIO, str]:
+    if output_archive != None:
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.external_attr = 0o644 << 16
+        # PNG files are already compressed
+        info.compress_type = zipfile.ZIP_STORED if name.endswith(".png") else zipfile.ZIP_DEFLATED
+        return output_archive.open(info, "w"), f"{output_path.absolute()}{ARCHIVE_SEPARATOR}/{name}"
+
+    if not output_path.exists():
+        os.makedirs(output_path)
+    # Outputs may be links to other outputs, which must not be written through
+    if (output_path / name).exists() or (output_path / name).is_symlink():
+        (output_path / name).unlink()
+    return open(output_path / name, "wb"), f"{output_path.absolute()}/{name}"
+
+def getOutputSize(output_path: Path, output_archive: zipfile.ZipFile, name: str) -> int:
+    if output_archive != None:
+        return output_archive.getinfo(name).file_size
+    return os.lstat(output_path / name).st_size
+
+def saveDuplicate(dedup: Deduplicator, key: str, output_path: Path, output_archive: zipfile.ZipFile, name: str) -> Tuple[str, int]:
+    first_name = dedup.find(key)
+    if output_archive != None:
+        dedup.linkMember(output_archive, first_name, name)
+        bytes_written = getOutputSize(output_path, output_archive, name) if first_name != name else 0
+        return f"{output_path.absolute()}{ARCHIVE_SEPARATOR}/{name}", bytes_written
+    
+    bytes_saved = dedup.bytes_saved
+    dedup.link(output_path / first_name, output_path / name)
+    # Links don't write the output again
+    bytes_written = getOutputSize(output_path, output_archive, name) if first_name != name and dedup.bytes_saved == bytes_saved else 0
+    return f"{output_path.absolute()}/{name}", bytes_written
+
+def convertFile(input_path: Path, output_path: Path, show_unidentified_image: bool, show_tracebacks: bool, input_file: BinaryIO = None, output_archive: zipfile.ZipFile = None, dedup: Deduplicator = None, image_output: ImageOutput = None, stats: dict = None):
+    # Archive members are read from the already opened input file
+    source = input_file if input_file != None else input_path
+    if image_output == None:
+        image_output = ImageOutput()
+    if stats == None:
+        stats = {}
     try:
-        texture = Texture3dst().open(input_path)
+        texture = Texture3dst().open(source)
         try:
-            image = texture.copy(0, 0, texture.size[0], texture.size[1])
-            if not output_path.exists():
-                os.makedirs(output_path)
-            image.save(f"{output_path}/{input_path.stem}.png")
-            print("File saved at:", f"{output_path.absolute()}/{input_path.stem}.png")
+            pixels = texture.toArray()
+            stats["pixels"] = texture.size[0] * texture.size[1]
+            name = f"{input_path.stem}{image_output.extension}"
+            key = dedup.hashArray(pixels, repr(image_output)) if dedup != None else None
+            if key != None:
+                dedup.discard(name, key)
+            if key != None and dedup.find(key) != None:
+                output_name, stats["bytes_written"] = saveDuplicate(dedup, key, output_path, output_archive, name)
+                print("File saved at:", output_name, "(duplicate)")
+                stats["output"] = output_name
+            else:
+                outputFile, output_name = openOutputFile(output_path, output_archive, name)
+                with outputFile:
+                    image_output.save(pixels, outputFile)
+                stats["bytes_written"] = getOutputSize(output_path, output_archive, name)
+                if key != None:
+                    dedup.add(key, name)
+                print("File saved at:", output_name)
+                stats["output"] = output_name
         except Exception as e:
             print("Error: Unable to convert file:", e)
             print(input_path.absolute())
@@ -28,13 +92,32 @@ def convertFile(input_path: Path, output_path: Path, show_unidentified_image: bo
             return 6
     except Texture3dstNoSignature:
         try:
-            image = Image.open(input_path)
+            if input_file != None:
+                input_file.seek(0)
+            image = Image.open(source)
             try:
-                texture = Texture3dst().fromImage(image)
-                if not output_path.exists():
-                    os.makedirs(output_path)
-                texture.export(f"{output_path}/{input_path.stem}.3dst")
-                print("File saved at:", f"{output_path.absolute()}/{input_path.stem}.3dst")
+                stats["pixels"] = image.size[0] * image.size[1]
+                name = f"{input_path.stem}.3dst"
+                key = None
+                if dedup != None:
+                    # Same conversion done by fromImage()
+                    image = image.convert("RGBA")
+                    key = dedup.hashImage(image, "rgba8")
+                    dedup.discard(name, key)
+                if key != None and dedup.find(key) != None:
+                    output_name, stats["bytes_written"] = saveDuplicate(dedup, key, output_path, output_archive, name)
+                    print("File saved at:", output_name, "(duplicate)")
+                    stats["output"] = output_name
+                else:
+                    texture = Texture3dst().fromImage(image)
+                    outputFile, output_name = openOutputFile(output_path, output_archive, name)
+                    with outputFile:
+                        texture.export(outputFile)
+                    stats["bytes_written"] = getOutputSize(output_path, output_archive, name)
+                    if key != None:
+                        dedup.add(key, name)
+                    print("File saved at:", output_name)
+                    stats["output"] = output_name
             except Exception as e:
                 print("Error: Unable to convert file:", e)
                 print(input_path.absolute())
@@ -54,6 +137,77 @@ def convertFile(input_path: Path, output_path: Path, show_unidentified_image: bo
         return 5
     return 0
 
+def convertAndReport(report: BatchReport, bytes_read: int, input_path: Path, *args, **kwargs) -> int:
+    if report == None:
+        return convertFile(input_path, *args, **kwargs)
+    
+    stats = {}
+    start = time.perf_counter()
+    status_code = convertFile(input_path, *args, stats=stats, **kwargs)
+    report.add(input_path.absolute(), status_code, time.perf_counter() - start, bytes_read, stats.get("bytes_written", 0), stats.get("pixels", 0), stats.get("output"))
+    return status_code
+
+def convertInputs(inputs: List[str], output_path: Path, output_archive: zipfile.ZipFile, recursive: bool, suppress_errors: bool, show_tracebacks: bool, dedup: Deduplicator = None, image_output: ImageOutput = None, report: BatchReport = None) -> int:
+    for path in inputs:
+        input_path = Path(path)
+        archive_path = splitArchivePath(path)
+        if archive_path == None and isArchive(input_path):
+            archive_path = (path, "")
+
+        if archive_path != None:
+            with zipfile.ZipFile(archive_path[0]) as archive:
+                members = list(iterArchiveMembers(archive, archive_path[1], recursive))
+                if not members:
+                    print("Error: Path doesn't exists")
+                    return 1
+                
+                # A single member is handled like a file, anything else like a directory
+                is_member = members[0].filename == archive_path[1].strip("/")
+                for info in members:
+                    member_path = Path(f"{archive_path[0]}{ARCHIVE_SEPARATOR}/{info.filename}")
+                    with archive.open(info) as input_file:
+                        status_code = convertAndReport(report, info.compress_size, member_path, output_path, show_unidentified_image=is_member, show_tracebacks=show_tracebacks, input_file=input_file, output_archive=output_archive, dedup=dedup, image_output=image_output)
+                    if status_code and not suppress_errors and (is_member or status_code != 7):
+                        return status_code
+        elif input_path.exists() and input_path.is_file():
+            status_code = convertAndReport(report, input_path.stat().st_size, input_path, output_path, show_unidentified_image=True, show_tracebacks=show_tracebacks, output_archive=output_archive, dedup=dedup, image_output=image_output)
+            if not suppress_errors and status_code:
+                return status_code
+        elif input_path.exists() and input_path.is_dir():
+            for file_path in iterInputFiles(input_path, recursive):
+                status_code = convertAndReport(report, file_path.stat().st_size, file_path, output_path, show_unidentified_image=False, show_tracebacks=show_tracebacks, output_archive=output_archive, dedup=dedup, image_output=image_output)
+                if status_code and not suppress_errors and status_code != 7:
+                    return status_code
+        else:
+            print("Error: Path doesn't exists")
+            return 1
+    return 0
+
+def iterInputFiles(input_path: Path, recursive: bool):
+    if recursive:
+        input_files = iglob(os.path.join(input_path.absolute(), "**"), recursive=True)
+    else:
+        input_files = iglob(os.path.join(input_path.absolute(), "*"))
+
+    for file in input_files:
+        file_path = Path(file)
+        if file_path.is_file():
+            yield file_path
+
+def findCounterpart(file_path: Path, input_path: Path, other_path: Path) -> Path:
+    counterpart = other_path / file_path.relative_to(input_path.absolute())
+    if not counterpart.exists():
+        counterpart = counterpart.with_suffix(".png")
+    return counterpart
+
+def writeReport(report: dict, output: str) -> None:
+    if output:
+        with open(output, "w") as reportFile:
+            json.dump(report, reportFile, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
 def main():
     parser = argparse.ArgumentParser(prog="py3dst", description="Display or convert 3DST textures")
     parser.add_argument(
@@ -83,19 +237,95 @@ def main():
         action="store_true",
         help="indicates whether to convert the provided file"
     )
+    parser.add_argument(
+        "--verify", 
+        action="store_true",
+        help="check the provided 3DST files for corruption without decoding them and print a JSON report"
+    )
+    parser.add_argument(
+        "--diff", 
+        nargs=2,
+        metavar=("A", "B"),
+        help="compare two textures, a texture and an image, or two directories and print a JSON report"
+    )
+    parser.add_argument(
+        "--diff-images", 
+        metavar=("DIR"),
+        action="store",
+        help="directory where difference images are saved when --diff flag used"
+    )
+    parser.add_argument(
+        "--hash", 
+        metavar=("ALGORITHM"),
+        action="store",
+        help="hash algorithm used to hash the payload of each file verified (e.g. 'sha256')"
+    )
+    parser.add_argument(
+        "-j", 
+        "--jobs", 
+        metavar=("N"),
+        type=int,
+        action="store",
+        help="number of processes used to process directories (default: number of CPUs)"
+    )
     parser.add_argument(
         "-i", 
         "--input", 
         metavar=("IN"),
         action="append",
-        help="files to convert"
+        help="files, directories or zip archives to convert, archive members can be selected like 'pack.zip!/path/file'"
     )
     parser.add_argument(
         "-o", 
         "--output", 
         metavar=("OUT"),
         action="store",
-        help="destination directory"
+        help="destination directory or zip archive, or report file if --verify or --diff flag used"
+    )
+    parser.add_argument(
+        "--dedup", 
+        metavar=("MODE"),
+        choices=Deduplicator.MODES,
+        action="store",
+        help="convert pixel-identical files once and make the rest hardlinks, symlinks or copies of the first output ('hardlink', 'symlink', 'copy'), archives always get copies"
+    )
+    parser.add_argument(
+        "--image-format", 
+        metavar=("FORMAT"),
+        choices=IMAGE_FORMATS,
+        default="png",
+        help="image format for converted 3DST textures ('png', 'tga', 'bmp', 'npy', 'raw'), 'raw' writes RGBA bytes without header and 'bmp' drops alpha"
+    )
+    parser.add_argument(
+        "--png-compression", 
+        metavar=("LEVEL"),
+        type=int,
+        choices=range(10),
+        help="zlib compression level for PNG output, from 0 (fastest) to 9 (smallest)"
+    )
+    parser.add_argument(
+        "--png-strategy", 
+        metavar=("STRATEGY"),
+        choices=PNG_STRATEGIES.keys(),
+        help="zlib strategy for PNG output ('default', 'filtered', 'huffman', 'rle', 'fixed')"
+    )
+    parser.add_argument(
+        "--events", 
+        metavar=("FILE"),
+        action="store",
+        help="write an event for every converted file and a final summary as JSON lines to the file, '-' for stdout (other messages then go to stderr)"
+    )
+    parser.add_argument(
+        "--summary", 
+        action="store_true",
+        help="print files per second, megapixels per second, bytes read and written, status codes and slowest files at the end"
+    )
+    parser.add_argument(
+        "--slowest", 
+        metavar=("N"),
+        type=int,
+        default=10,
+        help="number of slowest files listed in the summary (default: 10)"
     )
     parser.add_argument(
         "-r", 
@@ -115,18 +345,34 @@ def main():
     parser.add_argument("-v", "--version", action="version", version=__version__)
 
     args = parser.parse_args()
-    if args.touch and args.convert:
-        parser.error("conflicting flags, select only one -t --touch or -c --convert")
+    if [args.touch, args.convert, args.verify, args.diff != None].count(True) > 1:
+        parser.error("conflicting flags, select only one -t --touch, -c --convert, --verify or --diff")
     if args.touch and not args.path:
         parser.error("path is required with -t --touch flag")
-    if not args.convert and not args.path:
-        parser.error("path is required if not -c --convert flag used")
+    if not args.convert and not args.verify and not args.diff and not args.path:
+        parser.error("path is required if not -c --convert, --verify or --diff flag used")
+    if (args.png_compression != None or args.png_strategy) and args.image_format != "png":
+        parser.error("--png-compression and --png-strategy can only be used with png image format")
+    if (args.events or args.summary) and not args.convert:
+        parser.error("--events and --summary can only be used with -c --convert flag")
+    if args.slowest < 0:
+        parser.error("--slowest must be 0 or greater")
+    if args.dedup and not args.convert:
+        parser.error("--dedup can only be used with -c --convert flag")
+    if args.diff_images and not args.diff:
+        parser.error("--diff-images can only be used with --diff flag")
+    if args.verify and not args.input:
+        parser.error("-i --input is required if --verify flag used")
+    if args.hash and not args.verify:
+        parser.error("--hash can only be used with --verify flag")
+    if args.jobs != None and args.jobs <= 0:
+        parser.error("-j --jobs must be greater than 0")
     if args.convert and not args.input:
         parser.error("-i --input is required if -c --convert flag used")
     if args.convert and not args.output:
         parser.error("-o --output is required if -c --convert flag used")
 
-    if not args.convert and not args.touch:
+    if not args.convert and not args.touch and not args.verify and not args.diff:
         path = Path(args.path)
         if path.exists() and path.is_file():
             try:
@@ -168,29 +414,113 @@ def main():
             return 1
     elif args.convert:
         output_path = Path(args.output)
+        output_archive = None
+        dedup = Deduplicator(args.dedup) if args.dedup else None
+        image_output = ImageOutput(args.image_format, args.png_compression, args.png_strategy)
+        report = None
+        eventsFile = None
+        if args.events or args.summary:
+            if args.events == "-":
+                eventsFile = sys.stdout
+            elif args.events:
+                eventsFile = open(args.events, "w")
+            report = BatchReport(eventsFile, args.slowest)
+        # Output is written straight into the archive if a zip file is given
+        if output_path.suffix.lower() == ".zip":
+            if not output_path.parent.exists():
+                os.makedirs(output_path.parent)
+            output_archive = zipfile.ZipFile(output_path, "w")
         
+        # Events written to stdout must stay parseable, so messages go to stderr instead
+        with contextlib.redirect_stdout(sys.stderr) if args.events == "-" else contextlib.nullcontext():
+            try:
+                status_code = convertInputs(args.input, output_path, output_archive, args.recursive, args.suppress_errors, args.show_tracebacks, dedup, image_output, report)
+            finally:
+                if output_archive != None:
+                    output_archive.close()
+                if report != None:
+                    summary = report.finish()
+                    if eventsFile != None and args.events != "-":
+                        eventsFile.close()
+            if args.summary:
+                print(f"Files: {summary['files']} in {summary['elapsed']:.2f}s, {summary['files_per_second']:.2f} files/s, {summary['megapixels_per_second']:.2f} MP/s")
+                print(f"Read: {summary['bytes_read']} bytes, written: {summary['bytes_written']} bytes")
+                print("Status codes:", ", ".join(f"{status}: {count}" for status, count in sorted(summary["status"].items())))
+                if summary["slowest"]:
+                    print("Slowest files:")
+                    for file_report in summary["slowest"]:
+                        print(f"  {file_report['duration']:.3f}s {file_report['path']}")
+            if dedup != None:
+                dedup_summary = dedup.summary()
+                print(f"Deduplicated: {dedup_summary['duplicates']} of {dedup_summary['converted'] + dedup_summary['duplicates']} files reused a previous output, {dedup_summary['bytes_saved']} bytes saved")
+        if status_code:
+            return status_code
+    elif args.verify:
+        input_files = []
         for path in args.input:
             input_path = Path(path)
             if input_path.exists() and input_path.is_file():
-                input_path = Path(path)
-                status_code = convertFile(input_path, output_path, show_unidentified_image=True, show_tracebacks=args.show_tracebacks)
-                if not args.suppress_errors and status_code:
-                    return status_code
+                input_files.append(input_path)
             elif input_path.exists() and input_path.is_dir():
-                if args.recursive:
-                    input_files = iglob(os.path.join(input_path.absolute(), "**/**"), recursive=True)
-                else:
-                    input_files = iglob(os.path.join(input_path.absolute(), "**"))
-
-                for file in input_files:
-                    file_path = Path(file)
-                    if file_path.is_file():
-                        status_code = convertFile(file_path, output_path, show_unidentified_image=False, show_tracebacks=args.show_tracebacks)
-                        if status_code and not args.suppress_errors and status_code != 7:
-                            return status_code
+                for file_path in iterInputFiles(input_path, args.recursive):
+                    if file_path.suffix.lower() == ".3dst":
+                        input_files.append(file_path)
             else:
                 print("Error: Path doesn't exists")
                 return 1
+
+        try:
+            reports = verifyFiles(input_files, hash_name=args.hash, jobs=args.jobs)
+        except ValueError as e:
+            print("Error:", e)
+            return 10
+        invalid = sum(1 for report in reports if not report["valid"])
+        writeReport({
+            "files": reports,
+            "total": len(reports),
+            "valid": len(reports) - invalid,
+            "invalid": invalid
+        }, args.output)
+        if invalid:
+            return 9
+    elif args.diff:
+        path_a = Path(args.diff[0])
+        path_b = Path(args.diff[1])
+        diff_path = Path(args.diff_images) if args.diff_images else None
+        if not path_a.exists() or not path_b.exists():
+            print("Error: Path doesn't exists")
+            return 1
+
+        pairs = []
+        diff_images = []
+        if path_a.is_dir() and path_b.is_dir():
+            for file_path in iterInputFiles(path_a, args.recursive):
+                if file_path.suffix.lower() == ".3dst":
+                    pairs.append((file_path, findCounterpart(file_path, path_a, path_b)))
+                    if diff_path:
+                        diff_images.append((diff_path / file_path.relative_to(path_a.absolute())).with_suffix(".png"))
+        elif path_a.is_file() and path_b.is_file():
+            pairs.append((path_a, path_b))
+            if diff_path:
+                diff_images.append(diff_path / f"{path_a.stem}.png")
+        else:
+            print("Error: Paths must be both files or both directories")
+            return 2
+
+        for diff_image in diff_images:
+            os.makedirs(diff_image.parent, exist_ok=True)
+
+        reports = compareFiles(pairs, diff_images=diff_images if diff_path else None, jobs=args.jobs)
+        failed = sum(1 for report in reports if report["error"])
+        writeReport({
+            "files": reports,
+            "total": len(reports),
+            "identical": sum(1 for report in reports if report.get("identical")),
+            "different": sum(1 for report in reports if report.get("identical") == False),
+            "failed": failed
+        }, args.output)
+        if failed:
+            return 11
     else:
         print("Nothing has happened?")
 
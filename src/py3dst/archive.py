@@ -0,0 +1,61 @@
+import os
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterator, Tuple
+
+from .error_classes import *
+
+ARCHIVE_SEPARATOR = "!"
+
+def isArchive(path: str | Path) -> bool:
+    """
+    Returns if the path is a zip archive with '.zip' extension.
+    """
+    path = Path(path)
+    return path.suffix.lower() == ".zip" and path.is_file() and zipfile.is_zipfile(path)
+
+def splitArchivePath(path: str | Path) -> Tuple[str, str] | None:
+    """
+    Splits a path like 'pack.zip!/path/file' into the archive path and the member name.
+    Returns None if the path doesn't point inside an existing archive, so plain paths containing
+    the separator are still opened as files.
+    """
+    path = str(path)
+    for separator in ("/", os.sep):
+        index = path.find(ARCHIVE_SEPARATOR + separator)
+        while index != -1:
+            if isArchive(path[:index]):
+                return path[:index], path[index + 2:].replace(os.sep, "/")
+            index = path.find(ARCHIVE_SEPARATOR + separator, index + 1)
+    return None
+
+def openFile(path: str | Path) -> BinaryIO:
+    """
+    Opens a file for reading in binary mode. Paths like 'pack.zip!/path/file' open the member of the archive,
+    which is streamed from it without extracting it.
+    """
+    archive_path = splitArchivePath(path)
+    if archive_path == None:
+        return open(path, "rb")
+
+    # The archive stays open until the member is closed
+    with zipfile.ZipFile(archive_path[0]) as archive:
+        try:
+            return archive.open(archive_path[1])
+        except KeyError:
+            raise FileNotFoundError(f"No such member in archive: '{path}'")
+
+def iterArchiveMembers(archive: zipfile.ZipFile, prefix: str, recursive: bool) -> Iterator[zipfile.ZipInfo]:
+    """
+    Yields the files of the archive inside the prefix directory, or the member named as the prefix.
+    """
+    prefix = prefix.strip("/")
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        if info.filename == prefix:
+            yield info
+        elif not prefix or info.filename.startswith(prefix + "/"):
+            relative_name = info.filename[len(prefix):].lstrip("/")
+            if recursive or "/" not in relative_name:
+                yield info
@@ -0,0 +1,130 @@
+import math
+import numpy
+from PIL import Image
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from .tex3dst import Texture3dst, _headerTexture3dst, _readTexture3dstHeader, _readLevelArray, _decodePixelArray, _toRGBA
+from .utils import parallelMap
+from .error_classes import *
+
+_CHANNELS = ("r", "g", "b", "a")
+
+def _loadLevels(path: str | Path) -> Tuple[List[numpy.ndarray], bool]:
+    with open(path, "rb") as fileBuffer:
+        if fileBuffer.read(4) != b'3DST':
+            fileBuffer.seek(0)
+            image = Image.open(fileBuffer)
+            return [numpy.asarray(image.convert("RGBA"))], False
+
+        texture = Texture3dst()
+        texture.header = _headerTexture3dst()
+        _readTexture3dstHeader(fileBuffer, texture.header)
+        texture._validateHeader()
+        format = texture.header.format
+        pixel_lenght = texture._getFormatInfo(format)["pixel_lenght"]
+
+        levels = []
+        width = texture.header.full_size[0]
+        height = texture.header.full_size[1]
+        for i in range(texture.header.mip_level):
+            pixel_bytes = _readLevelArray(fileBuffer, width, height, pixel_lenght)
+            # All textures are upside down by default
+            pixels = _toRGBA(_decodePixelArray(pixel_bytes, format))[::-1]
+            if i == 0:
+                pixels = pixels[:texture.header.size[1], :texture.header.size[0]]
+            levels.append(pixels)
+            width = width // 2
+            height = height // 2
+        return levels, True
+
+def _levelMetrics(level: int, pixels_a: numpy.ndarray, pixels_b: numpy.ndarray) -> dict:
+    difference = numpy.abs(pixels_a.astype(numpy.int16) - pixels_b.astype(numpy.int16))
+    squared = difference.astype(numpy.float64) ** 2
+    channels_max = difference.max(axis=(0, 1))
+    channels_mse = squared.mean(axis=(0, 1))
+
+    max_error = {}
+    mse = {}
+    psnr = {}
+    for i, channel in enumerate(_CHANNELS):
+        max_error[channel] = int(channels_max[i])
+        mse[channel] = float(channels_mse[i])
+    max_error["all"] = int(channels_max.max())
+    mse["all"] = float(squared.mean())
+    # Identical channels have no PSNR
+    for channel, value in mse.items():
+        psnr[channel] = 10 * math.log10(0xFF ** 2 / value) if value > 0 else None
+
+    return {
+        "level": level,
+        "size": [pixels_a.shape[1], pixels_a.shape[0]],
+        "max_error": max_error,
+        "mse": mse,
+        "psnr": psnr
+    }
+
+def compare(a: str | Path, b: str | Path, diff_image: str | Path = None) -> dict:
+    """
+    Compares two 3DST files, or a 3DST file and an image, on their decoded RGBA pixels.
+    Reports max error, MSE and PSNR per channel for every mip level both files have.
+    Images are compared against the base level only.
+    If diff_image is provided, the absolute difference of the base level is saved there,
+    each color channel showing the larger of its own difference and the alpha difference.
+    """
+    if not isinstance(a, str) and not isinstance(a, Path):
+        raise TypeError(genericTypeErrorMessage("a", a, Union[str, Path]))
+    if not isinstance(b, str) and not isinstance(b, Path):
+        raise TypeError(genericTypeErrorMessage("b", b, Union[str, Path]))
+    if diff_image != None and not isinstance(diff_image, str) and not isinstance(diff_image, Path):
+        raise TypeError(genericTypeErrorMessage("diff_image", diff_image, Union[str, Path]))
+
+    levels_a, is_texture_a = _loadLevels(a)
+    levels_b, is_texture_b = _loadLevels(b)
+    if levels_a[0].shape != levels_b[0].shape:
+        raise ValueError(f"Texture sizes don't match: {levels_a[0].shape[1]}x{levels_a[0].shape[0]}, {levels_b[0].shape[1]}x{levels_b[0].shape[0]}")
+
+    levels = []
+    for i in range(min(len(levels_a), len(levels_b))):
+        levels.append(_levelMetrics(i, levels_a[i], levels_b[i]))
+
+    if diff_image != None:
+        difference = numpy.abs(levels_a[0].astype(numpy.int16) - levels_b[0].astype(numpy.int16)).astype(numpy.uint8)
+        difference = numpy.maximum(difference[..., :3], difference[..., 3:])
+        Image.fromarray(difference).save(diff_image)
+
+    # Images have no mip levels to compare
+    mip_level = [len(levels_a) if is_texture_a else None, len(levels_b) if is_texture_b else None]
+    max_error = max(level["max_error"]["all"] for level in levels)
+    return {
+        "a": str(a),
+        "b": str(b),
+        "identical": max_error == 0 and (None in mip_level or mip_level[0] == mip_level[1]),
+        "max_error": max_error,
+        "mip_level": mip_level,
+        "levels": levels,
+        "error": None
+    }
+
+def _compareSafe(files: Tuple[str | Path, str | Path, str | Path]) -> dict:
+    try:
+        return compare(*files)
+    except Exception as e:
+        return {
+            "a": str(files[0]),
+            "b": str(files[1]),
+            "error": str(e)
+        }
+
+def compareFiles(pairs: List[Tuple[str | Path, str | Path]], diff_images: List[str | Path] = None, jobs: int = None) -> List[dict]:
+    """
+    Compares every pair of files in parallel and returns their reports in the same order.
+    Pairs that can't be compared get a report with the 'error' message.
+    """
+    if diff_images == None:
+        diff_images = [None] * len(pairs)
+    elif len(diff_images) != len(pairs):
+        raise ValueError("'diff_images' must have the same length as 'pairs'")
+
+    files = [(a, b, diff_image) for (a, b), diff_image in zip(pairs, diff_images)]
+    return parallelMap(_compareSafe, files, jobs)
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import shutil
+import zipfile
+import numpy
+from PIL import Image
+from pathlib import Path
+
+from .error_classes import *
+
+class Deduplicator:
+    """
+    Remembers converted outputs by the hash of their decoded pixels, so textures that are
+    pixel-identical are converted once and the rest reuse the first output.
+    """
+    MODES = ("hardlink", "symlink", "copy")
+
+    def __init__(self, mode: str = "hardlink"):
+        if not isinstance(mode, str):
+            raise TypeError(genericTypeErrorMessage("mode", mode, str))
+        if mode not in self.MODES:
+            raise ValueError(f"Deduplication mode invalid: {mode}")
+
+        self.mode = mode
+        self.outputs = {}
+        self.converted = 0
+        self.duplicates = 0
+        self.bytes_saved = 0
+
+    def hashImage(self, image: Image.Image, target: str) -> str:
+        """
+        Returns the key of an image converted to the target, like 'png' or a texture format.
+        """
+        image_hash = hashlib.sha256()
+        image_hash.update(f"{target}:{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+        image_hash.update(image.tobytes())
+        return image_hash.hexdigest()
+
+    def hashArray(self, array: numpy.ndarray, target: str) -> str:
+        """
+        Returns the key of an array of decoded pixels converted to the target.
+        """
+        array_hash = hashlib.sha256()
+        array_hash.update(f"{target}:{array.dtype}:{array.shape}:".encode())
+        array_hash.update(numpy.ascontiguousarray(array).data)
+        return array_hash.hexdigest()
+
+    def find(self, key: str):
+        """
+        Returns the first output saved with the key, or None if there isn't one.
+        """
+        return self.outputs.get(key)
+
+    def add(self, key: str, output) -> None:
+        self.outputs[key] = output
+        self.converted += 1
+        return
+
+    def discard(self, output, key: str = None) -> None:
+        """
+        Forgets the output for every key but the given one, since it's about to be overwritten with other pixels.
+        """
+        for other_key in [other_key for other_key, other_output in self.outputs.items() if other_output == output and other_key != key]:
+            del self.outputs[other_key]
+        return
+
+    def link(self, source: Path, destination: Path) -> None:
+        """
+        Makes the destination a hardlink, symlink or copy of the source output, depending on the mode.
+        Hardlinks fall back to copies when the filesystem doesn't support them.
+        """
+        self.duplicates += 1
+        # A destination already linked to the source saves no more space, so it's left as it is
+        if destination.exists() and os.path.samefile(source, destination):
+            return
+        if destination.exists() or destination.is_symlink():
+            destination.unlink()
+
+        if self.mode == "hardlink":
+            try:
+                os.link(source, destination)
+                self.bytes_saved += source.stat().st_size
+                return
+            except OSError:
+                pass
+        elif self.mode == "symlink":
+            os.symlink(os.path.relpath(source.absolute(), destination.absolute().parent), destination)
+            self.bytes_saved += source.stat().st_size
+            return
+        shutil.copyfile(source, destination)
+        return
+
+    def linkMember(self, archive: zipfile.ZipFile, source: str, destination: str) -> None:
+        """
+        Copies the source member of an archive being written to the destination, since archives can't link members.
+        """
+        self.duplicates += 1
+        if source == destination:
+            return
+        
+        source_info = archive.getinfo(source)
+        info = zipfile.ZipInfo(destination, date_time=source_info.date_time)
+        info.external_attr = source_info.external_attr
+        info.compress_type = source_info.compress_type
+        archive.writestr(info, archive.read(source_info))
+        return
+
+    def summary(self) -> dict:
+        return {
+            "mode": self.mode,
+            "converted": self.converted,
+            "duplicates": self.duplicates,
+            "bytes_saved": self.bytes_saved
+        }
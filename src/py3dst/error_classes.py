@@ -15,6 +15,10 @@ class Texture3dstUnexpectedEndOfFile(Texture3dstException):
     def __init__(self):
         super().__init__("Unexpected end of file")
 
+class Texture3dstReadOnly(Texture3dstException):
+    def __init__(self):
+        super().__init__("Texture is read-only")
+
 def formatType(annotation) -> str:
     if hasattr(annotation, '__origin__') and annotation.__origin__ is Union:
         types = get_args(annotation)
@@ -0,0 +1,66 @@
+import zlib
+import numpy
+from PIL import Image
+
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from .tex3dst import _toRGBA
+from .error_classes import *
+
+IMAGE_FORMATS = ("png", "tga", "bmp", "npy", "raw")
+PNG_STRATEGIES = {
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "huffman": zlib.Z_HUFFMAN_ONLY,
+    "rle": zlib.Z_RLE,
+    "fixed": zlib.Z_FIXED
+}
+_EXTENSIONS = {"png": ".png", "tga": ".tga", "bmp": ".bmp", "npy": ".npy", "raw": ".rgba"}
+
+@dataclass
+class ImageOutput:
+    """
+    Encoding used to save decoded textures.
+    'raw' writes the RGBA bytes of the pixels without any header, and 'npy' writes the decoded array.
+    'bmp' has no alpha, so it's dropped from the pixels.
+    compress_level (0 to 9) and strategy are only used by 'png', PIL defaults are used when they are None.
+    """
+    format: str = "png"
+    compress_level: int = None
+    strategy: str = None
+
+    def __post_init__(self):
+        if self.format not in IMAGE_FORMATS:
+            raise ValueError(f"Image format invalid: {self.format}")
+        if self.compress_level != None and (not isinstance(self.compress_level, int) or self.compress_level < 0 or self.compress_level > 9):
+            raise ValueError("'compress_level' must be between 0 and 9")
+        if self.strategy != None and self.strategy not in PNG_STRATEGIES:
+            raise ValueError(f"PNG strategy invalid: {self.strategy}")
+
+    @property
+    def extension(self) -> str:
+        return _EXTENSIONS[self.format]
+
+    def save(self, pixels: numpy.ndarray, fileBuffer: BinaryIO) -> None:
+        """
+        Saves an array of decoded pixels, like the one returned by Texture3dst.toArray(), to the file.
+        """
+        match self.format:
+            case "npy":
+                numpy.save(fileBuffer, pixels)
+            case "raw":
+                fileBuffer.write(_toRGBA(pixels).tobytes())
+            case "png":
+                params = {}
+                if self.compress_level != None:
+                    params["compress_level"] = self.compress_level
+                if self.strategy != None:
+                    params["compress_type"] = PNG_STRATEGIES[self.strategy]
+                Image.fromarray(pixels).save(fileBuffer, format="PNG", **params)
+            case "tga":
+                Image.fromarray(pixels).save(fileBuffer, format="TGA")
+            case "bmp":
+                # BMP readers ignore alpha, so it's dropped instead of written as 32-bit pixels that look opaque
+                Image.fromarray(pixels[..., 0] if pixels.shape[-1] == 2 else pixels[..., :3]).save(fileBuffer, format="BMP")
+        return
@@ -0,0 +1,72 @@
+import json
+import time
+from pathlib import Path
+from typing import TextIO
+
+class BatchReport:
+    """
+    Collects the result of every file of a batch run and summarizes its throughput.
+    If an events stream is provided, every file and the summary are written to it as JSON lines.
+    """
+    def __init__(self, events: TextIO = None, slowest: int = 10):
+        if slowest < 0:
+            raise ValueError("'slowest' must be a positive integer")
+
+        self.events = events
+        self.slowest = slowest
+        self.files = []
+        self._start = time.perf_counter()
+        self._writeEvent({"event": "start", "time": time.time()})
+
+    def _writeEvent(self, event: dict) -> None:
+        if self.events != None:
+            self.events.write(json.dumps(event) + "\n")
+            self.events.flush()
+        return
+
+    def add(self, path: str | Path, status: int, duration: float, bytes_read: int = 0, bytes_written: int = 0, pixels: int = 0, output: str = None) -> None:
+        """
+        Records the result of a file, status being the code returned by convertFile().
+        """
+        file_report = {
+            "event": "file",
+            "path": str(path),
+            "status": status,
+            "duration": duration,
+            "bytes_read": bytes_read,
+            "bytes_written": bytes_written,
+            "pixels": pixels,
+            "output": output
+        }
+        self.files.append(file_report)
+        self._writeEvent(file_report)
+        return
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self._start
+        status_counts = {}
+        for file_report in self.files:
+            status_counts[str(file_report["status"])] = status_counts.get(str(file_report["status"]), 0) + 1
+        pixels = sum(file_report["pixels"] for file_report in self.files)
+        slowest = sorted(self.files, key=lambda file_report: file_report["duration"], reverse=True)[:self.slowest]
+
+        return {
+            "event": "summary",
+            "files": len(self.files),
+            "elapsed": elapsed,
+            "files_per_second": len(self.files) / elapsed if elapsed > 0 else 0.0,
+            "megapixels": pixels / 1000000,
+            "megapixels_per_second": pixels / 1000000 / elapsed if elapsed > 0 else 0.0,
+            "bytes_read": sum(file_report["bytes_read"] for file_report in self.files),
+            "bytes_written": sum(file_report["bytes_written"] for file_report in self.files),
+            "status": status_counts,
+            "slowest": [{"path": file_report["path"], "duration": file_report["duration"], "status": file_report["status"]} for file_report in slowest]
+        }
+
+    def finish(self) -> dict:
+        """
+        Writes the summary to the events stream and returns it.
+        """
+        summary = self.summary()
+        self._writeEvent(summary)
+        return summary
@@ -0,0 +1,141 @@
+import os
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+from .tex3dst import Texture3dst, _headerTexture3dst, _PixelData
+from .error_classes import *
+
+class SharedTexture3dst:
+    """
+    Decoded texture stored in shared memory, so other processes can use it without copying or pickling its pixels.
+
+    The process that publishes the texture owns the shared memory and must call unlink() once every
+    process is done with it. Every process, including the owner, must call close() when it stops using
+    the texture; the texture can't be used after that.
+    """
+    def __init__(self):
+        self.texture = None
+        self.info = None
+        self._shared_memory = None
+        self._in_use = []
+        self._owner = False
+
+    def publish(self, texture: Texture3dst, name: str = None):
+        """
+        Copies the pixel data of the texture to a new shared memory block.
+        """
+        if not isinstance(texture, Texture3dst):
+            raise TypeError(genericTypeErrorMessage("texture", texture, Texture3dst))
+        if name != None and not isinstance(name, str):
+            raise TypeError(genericTypeErrorMessage("name", name, str))
+
+        pixel_buffer = texture.textureData.buffer
+        self._shared_memory = shared_memory.SharedMemory(name=name, create=True, size=max(len(pixel_buffer), 1))
+        self._shared_memory.buf[:len(pixel_buffer)] = pixel_buffer
+        self._owner = True
+
+        self.info = {
+            "name": self._shared_memory.name,
+            "mode": texture.header.mode,
+            "format": texture.header.format,
+            "full_size": list(texture.header.full_size),
+            "size": list(texture.size),
+            "mip_level": texture.header.mip_level
+        }
+        self._attachTexture()
+        return self
+
+    def attach(self, info: dict):
+        """
+        Attaches to a texture published by another process, using the info of the published texture.
+        """
+        if not isinstance(info, dict):
+            raise TypeError(genericTypeErrorMessage("info", info, dict))
+
+        self._owner = False
+        self.info = dict(info)
+        self._shared_memory = self._openSharedMemory()
+        self._attachTexture()
+        return self
+
+    def _openSharedMemory(self) -> shared_memory.SharedMemory:
+        # Only the owner must track the shared memory, or the resource tracker of an attached process
+        # could unlink it when that process exits
+        if sys.version_info >= (3, 13):
+            return shared_memory.SharedMemory(name=self.info["name"], track=self._owner)
+        if self._owner:
+            return shared_memory.SharedMemory(name=self.info["name"])
+        # Older versions can't disable tracking, and unregistering afterwards would also untrack it for
+        # the owner when the resource tracker is shared with it, so registering is skipped instead
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None if rtype == "shared_memory" else register(name, rtype)
+        try:
+            return shared_memory.SharedMemory(name=self.info["name"])
+        finally:
+            resource_tracker.register = register
+
+    def _attachTexture(self) -> None:
+        header = _headerTexture3dst()
+        header.mode = self.info["mode"]
+        header.format = self.info["format"]
+        header.full_size = list(self.info["full_size"])
+        header.size = list(self.info["size"])
+        header.mip_level = self.info["mip_level"]
+
+        texture = Texture3dst() if self.texture == None else self.texture
+        texture.header = header
+        texture._validateHeader()
+        texture.size = tuple(self.info["size"])
+        pixel_lenght = texture._getFormatInfo(header.format)["pixel_lenght"]
+        texture.textureData = _PixelData(header.full_size[0], header.full_size[1], pixel_lenght, self._shared_memory.buf.toreadonly())
+        self.texture = texture
+        return
+
+    def close(self) -> None:
+        """
+        Releases the texture and closes this process' access to the shared memory.
+        Raises BufferError, leaving the texture usable, if views or arrays of its pixels are still alive.
+        """
+        # Memory that couldn't be closed before is closed once nothing uses it
+        while len(self._in_use) > 0:
+            self._in_use[-1].close()
+            self._in_use.pop()
+        if self.texture == None:
+            return
+
+        self.texture.textureData.release()
+        try:
+            self._shared_memory.close()
+        except BufferError:
+            # The memory stays mapped for the views still using it, and is opened again for the texture
+            self._in_use.append(self._shared_memory)
+            self._shared_memory = self._openSharedMemory()
+            self._attachTexture()
+            raise
+        self.texture = None
+        return
+
+    def unlink(self) -> None:
+        """
+        Frees the shared memory. Only the process that published the texture can unlink it.
+        Memory that was already freed is ignored.
+        """
+        if not self._owner:
+            raise Texture3dstException("Only the process that published the texture can unlink it")
+        try:
+            self._shared_memory.unlink()
+        except FileNotFoundError:
+            # The memory is still registered to be freed when this process exits
+            if os.name == "posix":
+                resource_tracker.unregister(self._shared_memory._name, "shared_memory")
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.close()
+        finally:
+            if self._owner:
+                self.unlink()
@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from typing import BinaryIO, Tuple, List, Union
 
 from .primitive_types import read_uint32, write_uint32
+from .archive import openFile
 from .utils import isPowerOfTwo, getClosestPowerOfTwo, maxIntBits
 from .error_classes import *
 
@@ -38,6 +39,111 @@ def _getTexturePosition(x: int, y: int, width: int) -> Tuple[int]:
         x2 = dst_pos - (y2*width)
         return (x2, y2)
 
+def _getTexturePositionArray(width: int, height: int) -> numpy.ndarray:
+    y, x = numpy.indices((height, width), dtype=numpy.int64)
+    return ((((y >> 3) * (width >> 3) + (x >> 3)) << 6) + ((x & 1) | ((y & 1) << 1) | ((x & 2) << 1) | ((y & 2) << 2) | ((x & 4) << 2) | ((y & 4) << 3)))
+
+def _readLevelArray(fileBuffer: BinaryIO, width: int, height: int, length: int) -> numpy.ndarray:
+    level_data = fileBuffer.read(width * height * length)
+    if len(level_data) < width * height * length:
+        raise Texture3dstUnexpectedEndOfFile()
+    
+    dst_pos = _getTexturePositionArray(width, height)
+    if dst_pos.max() >= width * height:
+        raise Texture3dstException(f"Level size can not be rearranged: {width}x{height}")
+    return numpy.frombuffer(level_data, dtype=numpy.uint8).reshape(width * height, length)[dst_pos]
+
+def _decodePixelArray(pixel_bytes: numpy.ndarray, format: int) -> numpy.ndarray:
+    # Same conversions as _convertBytesToPixelData, applied to a whole array of pixels
+    pixel_value = numpy.zeros(pixel_bytes.shape[:-1], dtype=numpy.uint32)
+    for i in range(pixel_bytes.shape[-1]):
+        pixel_value |= pixel_bytes[..., i].astype(numpy.uint32) << (8 * i)
+
+    match format:
+        case 0: # rgba8
+            channels = ((pixel_value >> 24) & 0xFF, (pixel_value >> 16) & 0xFF, (pixel_value >> 8) & 0xFF, pixel_value & 0xFF)
+        case 1: # rgb8
+            channels = ((pixel_value >> 16) & 0xFF, (pixel_value >> 8) & 0xFF, pixel_value & 0xFF)
+        case 2: # rgba5551
+            channels = (((pixel_value >> 11) & 0b11111) / maxIntBits(5) * 0xFF,
+                        ((pixel_value >> 6) & 0b11111) / maxIntBits(5) * 0xFF,
+                        ((pixel_value >> 1) & 0b11111) / maxIntBits(5) * 0xFF,
+                        (pixel_value & 0b1) * 0xFF)
+        case 3: # rgb565
+            channels = (((pixel_value >> 11) & 0b11111) / maxIntBits(5) * 0xFF,
+                        ((pixel_value >> 5) & 0b111111) / maxIntBits(6) * 0xFF,
+                        (pixel_value & 0b11111) / maxIntBits(5) * 0xFF)
+        case 4: # rgba4
+            channels = (((pixel_value >> 12) & 0xF) / 0xF * 0xFF,
+                        ((pixel_value >> 8) & 0xF) / 0xF * 0xFF,
+                        ((pixel_value >> 4) & 0xF) / 0xF * 0xFF,
+                        (pixel_value & 0xF) / 0xF * 0xFF)
+        case 5: # la8
+            channels = ((pixel_value >> 8) & 0xFF, pixel_value & 0xFF)
+        case 9: # la4
+            channels = (((pixel_value >> 4) & 0xF) / 0xF * 0xFF, (pixel_value & 0xF) / 0xF * 0xFF)
+        case _:
+            raise ValueError("Texture 'format' value invalid")
+    return numpy.stack([channel.astype(numpy.uint8) for channel in channels], axis=-1)
+
+def _toRGBA(pixels: numpy.ndarray) -> numpy.ndarray:
+    match pixels.shape[-1]:
+        case 4:
+            return pixels
+        case 3:
+            alpha = numpy.full(pixels.shape[:-1] + (1,), 0xFF, dtype=numpy.uint8)
+            return numpy.concatenate((pixels, alpha), axis=-1)
+        case 2:
+            return pixels[..., [0, 0, 0, 1]]
+        case _:
+            raise ValueError(f"Unexpected number of channels: {pixels.shape[-1]}")
+
+def _encodePixelArray(pixels: numpy.ndarray, format: int, length: int) -> numpy.ndarray:
+    # Same conversions as _convertPixelDataToBytes, applied to a whole array of pixels
+    pixels = pixels.astype(numpy.uint32)
+    match format:
+        case 0: # rgba8
+            combined = (pixels[..., 0] << 24) | (pixels[..., 1] << 16) | (pixels[..., 2] << 8) | pixels[..., 3]
+        case 1: # rgb8
+            combined = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+        case 2: # rgba5551
+            r = (pixels[..., 0] / 0xFF * maxIntBits(5)).astype(numpy.uint32)
+            g = (pixels[..., 1] / 0xFF * maxIntBits(5)).astype(numpy.uint32)
+            b = (pixels[..., 2] / 0xFF * maxIntBits(5)).astype(numpy.uint32)
+            a = (pixels[..., 3] > 127).astype(numpy.uint32)
+            combined = (r << 11) | (g << 6) | (b << 1) | a
+        case 3: # rgb565
+            r = (pixels[..., 0] / 0xFF * maxIntBits(5)).astype(numpy.uint32)
+            g = (pixels[..., 1] / 0xFF * maxIntBits(6)).astype(numpy.uint32)
+            b = (pixels[..., 2] / 0xFF * maxIntBits(5)).astype(numpy.uint32)
+            combined = (r << 11) | (g << 5) | b
+        case 4: # rgba4
+            r = (pixels[..., 0] / 0xFF * maxIntBits(4)).astype(numpy.uint32)
+            g = (pixels[..., 1] / 0xFF * maxIntBits(4)).astype(numpy.uint32)
+            b = (pixels[..., 2] / 0xFF * maxIntBits(4)).astype(numpy.uint32)
+            a = (pixels[..., 3] / 0xFF * maxIntBits(4)).astype(numpy.uint32)
+            combined = (r << 12) | (g << 8) | (b << 4) | a
+        case 5: # la8
+            combined = (pixels[..., 0] << 8) | pixels[..., 1]
+        case 9: # la4
+            l = ((pixels[..., 0] / 0xFF) * maxIntBits(4)).astype(numpy.uint32)
+            a = ((pixels[..., 1] / 0xFF) * maxIntBits(4)).astype(numpy.uint32)
+            combined = (l << 4) | a
+        case _:
+            raise ValueError("Texture 'format' value invalid")
+    return numpy.stack([((combined >> (8 * i)) & 0xFF).astype(numpy.uint8) for i in range(length)], axis=-1)
+
+def _getImageMode(format: int) -> str:
+    match format:
+        case 0 | 2 | 4: # rgba8 | rgba5551 | rgba4
+            return "RGBA"
+        case 1 | 3: # rgb8 | rgb565
+            return "RGB"
+        case 5 | 9: # la8 | la4
+            return "LA"
+        case _:
+            raise ValueError("Texture 'format' value invalid")
+
 def _checkListType(obj: list | tuple, istype):
     for element in obj:
         if not isinstance(element, istype):
@@ -50,33 +156,116 @@ def _checkListRange(obj: list | tuple, min: int, max: int):
             return False
     return True
 
-def _createPixelDataStructure(width: int, height: int, length: int) -> List[List[int]]:
-    list_structure = [[] for _ in range(height)]
-    for element in list_structure:
-        for _ in range(width):
-            element.append(bytes(length))
-    return list_structure
+class _PixelRow:
+    """
+    View of one row of a _PixelData, indexed like a list of pixel bytes.
+    """
+    def __init__(self, pixel_data: "_PixelData", y: int):
+        self._pixel_data = pixel_data
+        self._offset = y * pixel_data.width * pixel_data.length
+        self._y = y
+
+    def _getPixelSlice(self, x: int) -> slice:
+        if x < 0:
+            x += self._pixel_data.width
+        if x < 0 or x >= self._pixel_data.width:
+            raise IndexError("pixel index out of range")
+        start = self._offset + x * self._pixel_data.length
+        return slice(start, start + self._pixel_data.length)
+
+    def __len__(self) -> int:
+        return self._pixel_data.width
+
+    def __getitem__(self, x: int) -> bytes:
+        return self._pixel_data.buffer[self._getPixelSlice(x)].tobytes()
+
+    def __setitem__(self, x: int, value: bytes) -> None:
+        self._pixel_data._checkWritable()
+        if len(value) != self._pixel_data.length:
+            raise ValueError(f"Pixel must be {self._pixel_data.length} bytes long, not {len(value)}")
+        self._pixel_data.buffer[self._getPixelSlice(x)] = value
+
+    def __iter__(self):
+        for x in range(self._pixel_data.width):
+            yield self[x]
+
+    def reverse(self) -> None:
+        self._pixel_data._checkWritable()
+        row = self._pixel_data.toArray()[self._y]
+        row[:] = row[::-1].copy()
+        return
 
-def _matrixToLinear(obj: List[List[bytes]]) -> List[bytes]:
-    linear = []
-    for element in obj:
-        for value in element:
-            linear.append(value)
-    return linear
+class _PixelData:
+    """
+    Packed pixel storage indexed like a list of rows of pixel bytes.
+    The buffer can be any object supporting the buffer protocol, read-only buffers make the storage read-only.
+    """
+    def __init__(self, width: int, height: int, length: int, buffer = None):
+        self.width = width
+        self.height = height
+        self.length = length
+        if buffer is None:
+            buffer = bytearray(width * height * length)
+        buffer = memoryview(buffer).cast("B")
+        if len(buffer) < width * height * length:
+            raise ValueError(f"Buffer too small for pixel data: {len(buffer)} bytes")
+        self.buffer = buffer[:width * height * length]
+
+    @property
+    def readonly(self) -> bool:
+        return self.buffer.readonly
+
+    def _checkWritable(self) -> None:
+        if self.buffer.readonly:
+            raise Texture3dstReadOnly()
+
+    def toArray(self) -> numpy.ndarray:
+        return numpy.frombuffer(self.buffer, dtype=numpy.uint8).reshape(self.height, self.width, self.length)
+
+    def release(self) -> None:
+        self.buffer.release()
+        return
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> _PixelRow:
+        if y < 0:
+            y += self.height
+        if y < 0 or y >= self.height:
+            raise IndexError("row index out of range")
+        return _PixelRow(self, y)
+
+    def __iter__(self):
+        for y in range(self.height):
+            yield _PixelRow(self, y)
+
+    def reverse(self) -> None:
+        self._checkWritable()
+        rows = self.toArray()
+        rows[:] = rows[::-1].copy()
+        return
 
-def _joinBytesList(obj: List[bytes]) -> bytearray:
-    array = bytearray()
-    for value in obj:
-        array.extend(value)
-    return array
+    def append(self, row: List[bytes]) -> None:
+        self._checkWritable()
+        row_data = b"".join(row)
+        if len(row_data) != self.width * self.length:
+            raise ValueError(f"Row must be {self.width * self.length} bytes long, not {len(row_data)}")
+        # The storage is reallocated since buffers in use can't be resized
+        # Arrays still using the previous storage keep it alive, so it's left for them instead of released
+        buffer = bytearray(self.buffer)
+        buffer.extend(row_data)
+        self.buffer = memoryview(buffer)
+        self.height += 1
+        return
 
-def _matrixToBytearray(obj: List[List[bytes]]):
-    return _joinBytesList(_matrixToLinear(obj))
+def _createPixelDataStructure(width: int, height: int, length: int) -> _PixelData:
+    return _PixelData(width, height, length)
 
 class Texture3dst:
     header: _headerTexture3dst
     size: List[int]
-    textureData: List[List[bytes]]
+    textureData: _PixelData
     FORMATS = (("rgba8", True, 4, 4),
                ("rgb8", True, 3, 3),
                ("rgba5551", True, 2, 4),
@@ -229,22 +418,7 @@ class Texture3dst:
                 raise ValueError("Texture 'format' value invalid")
         return combined
 
-    def open(self, path: str | Path):
-        # Validate types
-        if  not isinstance(path, str) and not isinstance(path, Path):
-            raise TypeError(genericTypeErrorMessage("path", path, Union[str, Path]))
-        
-        # File from the texture will be loaded
-        textureFileBuffer = open(path, "rb")
-        
-        # File signature
-        if textureFileBuffer.read(4) != b'3DST':
-            raise Texture3dstNoSignature()
-        
-        # Header of the file
-        self.header = _headerTexture3dst()
-        _readTexture3dstHeader(textureFileBuffer, self.header)
-        
+    def _validateHeader(self) -> None:
         # Only mode 3 is supported
         if self.header.mode != 3:
             raise Texture3dstUnsupported(f"Unsupported mode: {self.header.mode}")
@@ -271,30 +445,53 @@ class Texture3dst:
             raise ValueError("Mip level must be greater than 0")
         if not _isMipLevelValid(full_width, full_height, mip_level):
             raise Texture3dstException("Mip level' value greater than supported")
+        return
+
+    def _getPayloadSize(self) -> int:
+        format_info = self._getFormatInfo(self.header.format)
+        width = self.header.full_size[0]
+        height = self.header.full_size[1]
+        payload_size = 0
+        for _ in range(self.header.mip_level):
+            payload_size += width * height * format_info["pixel_lenght"]
+            width = width // 2
+            height = height // 2
+        return payload_size
+
+    def open(self, path: str | Path | BinaryIO):
+        # Validate types
+        if  not isinstance(path, str) and not isinstance(path, Path) and not hasattr(path, "read"):
+            raise TypeError(genericTypeErrorMessage("path", path, Union[str, Path, BinaryIO]))
+        
+        # File from the texture will be loaded, it can be an archive member like 'pack.zip!/path/file'
+        if hasattr(path, "read"):
+            textureFileBuffer = path
+        else:
+            textureFileBuffer = openFile(path)
+        
+        # File signature
+        if textureFileBuffer.read(4) != b'3DST':
+            raise Texture3dstNoSignature()
+        
+        # Header of the file
+        self.header = _headerTexture3dst()
+        _readTexture3dstHeader(textureFileBuffer, self.header)
+        
+        self._validateHeader()
+        format_info = self._getFormatInfo(self.header.format)
+        full_width = self.header.full_size[0]
+        full_height = self.header.full_size[1]
 
         # Save size
         self.size = (int(self.header.size[0]), int(self.header.size[1]))
 
-        unarranged_texture_data = _createPixelDataStructure(full_width, full_height, format_info["pixel_lenght"])
-        # Gets all pixel data from file
-        for i in range(full_height):
-            for j in range(full_width):
-                pixel_read = textureFileBuffer.read(format_info["pixel_lenght"])
-                if not pixel_read:
-                    raise Texture3dstUnexpectedEndOfFile
-                unarranged_texture_data[i][j] = pixel_read
-
-        textureFileBuffer.close()
-
-        self.textureData = _createPixelDataStructure(full_width, full_height, format_info["pixel_lenght"])
-        # Arrange pixel data in place
-        for i in range(full_height):
-            for j in range(full_width):
-                dst_pos = _getTexturePosition(j, i, full_width)
-                self.textureData[i][j] = unarranged_texture_data[dst_pos[1]][dst_pos[0]]
+        # Gets all pixel data from file and arranges it
+        pixel_bytes = _readLevelArray(textureFileBuffer, full_width, full_height, format_info["pixel_lenght"])
+        if textureFileBuffer is not path:
+            textureFileBuffer.close()
 
         # All textures are upside down by default
-        self.flipVertical()
+        self.textureData = _PixelData(full_width, full_height, format_info["pixel_lenght"], bytearray(pixel_bytes[::-1]))
         return self
 
     def new(self, width: int, height: int, mip_level: int = 1, format: str = "rgba8"):
@@ -411,18 +608,14 @@ class Texture3dst:
         elif x2 <= x1:
             raise ValueError("x2 coordinates must be greater than x1")
         
-        if y1 < 0 and y1 >= self.size[1]:
+        if y1 < 0 or y1 >= self.size[1]:
             raise ValueError("y1 coordinates out of range")
-        if y2 < 0 and y2 > self.size[1]:
+        if y2 < 0 or y2 > self.size[1]:
             raise ValueError("y2 coordinates out of range")
         elif y2 <= y1:
             raise ValueError("y2 coordinates must be greater than y1")
         
-        copy_data = [[] for _ in  range(y2 - y1)]
-        for i in range(y1, y2):
-            for j in range(x1, x2):
-                copy_data[i - y1].append(self.getPixel(j, i))
-        data_buffer = numpy.asarray(copy_data, dtype=numpy.uint8)
+        data_buffer = _decodePixelArray(self.textureData.toArray()[y1:y2, x1:x2], self.header.format)
         return Image.fromarray(data_buffer)
 
     def fromImage(self, image: Image.Image, format: str = "rgba8"):
@@ -440,11 +633,71 @@ class Texture3dst:
         else:
             raise ValueError(f"Texture format invalid: {format}")
         
-        img_w, img_h = image.size
+        return self.fromArray(numpy.asarray(image.convert(_getImageMode(format_match))), format=format)
+
+    def fromArray(self, array, format: str = "rgba8"):
+        """
+        Creates a new texture from an array of shape (height, width, channels) with values between 0 and 255.
+        The array can be any object numpy can convert, like a PIL image or another texture's toArray().
+        Channels are the ones of the format, or RGBA for any format, which is converted like fromImage() does.
+        """
+        if not isinstance(format, str):
+            raise TypeError(genericTypeErrorMessage("format", format, str))
+
+        # Verify format and support
+        format_match = self._matchFormat(format.lower())
+        if format_match != None:
+            format_info = self._getFormatInfo(format_match)
+            if not format_info["supported"]:
+                raise Texture3dstUnsupported(f"Texture format unsupported: {format}, '{format_info['name']}'")
+        else:
+            raise ValueError(f"Texture format invalid: {format}")
+
+        array = numpy.asarray(array)
+        if array.ndim != 3 or array.shape[2] not in (format_info["pixel_channels"], 4):
+            raise ValueError(f"'array' shape must be (height, width, {format_info['pixel_channels']}) or (height, width, 4) for format: {format}, not {array.shape}")
+        if not numpy.issubdtype(array.dtype, numpy.integer):
+            raise TypeError("'array' must only contain int values")
+        if array.size and (array.min() < 0 or array.max() > 255):
+            raise ValueError("'array' values must be between 0 and 255")
+        if array.shape[2] != format_info["pixel_channels"]:
+            array = numpy.asarray(Image.fromarray(array.astype(numpy.uint8), "RGBA").convert(_getImageMode(format_match)))
+
+        img_h, img_w = array.shape[:2]
         self.new(img_w, img_h, format=format)
-        self.paste(image, 0, 0)
+        self.textureData.toArray()[:img_h, :img_w] = _encodePixelArray(array, format_match, format_info["pixel_lenght"])
         return self
 
+    def toArray(self, rgba: bool = False) -> numpy.ndarray:
+        """
+        Returns a new array of shape (height, width, channels) with the decoded pixels of the texture.
+        Channels are the ones of the format, like 3 for rgb8 or 2 for la8, unless rgba is True.
+        """
+        if not isinstance(rgba, bool):
+            raise TypeError(genericTypeErrorMessage("rgba", rgba, bool))
+        
+        pixels = _decodePixelArray(self.textureData.toArray()[:self.size[1], :self.size[0]], self.header.format)
+        return _toRGBA(pixels) if rgba else pixels
+
+    def getBuffer(self) -> memoryview:
+        """
+        Returns a memoryview of the packed pixel storage, with shape (full height, full width, pixel lenght).
+        Pixels are encoded in the texture format and rows are in image order, padded to the full size.
+        """
+        return self.textureData.buffer.cast("B", [self.textureData.height, self.textureData.width, self.textureData.length])
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return self.getBuffer()
+
+    def __array__(self, dtype=None, copy=None) -> numpy.ndarray:
+        # The array holds an export of the storage, so the storage stays alive and shared memory can't be closed while the array is in use
+        array = numpy.frombuffer(self.textureData.buffer, dtype=numpy.uint8).reshape(self.textureData.height, self.textureData.width, self.textureData.length)
+        if dtype != None and array.dtype != dtype:
+            return array.astype(dtype)
+        if copy:
+            return array.copy()
+        return array
+
     def paste(self, image: Image.Image, x: int, y: int) -> None:
         if not isinstance(image, Image.Image):
             raise TypeError(genericTypeErrorMessage("image", image, Image.Image))
@@ -458,15 +711,7 @@ class Texture3dst:
         if img_width > x + self.size[0] or img_height > y + self.size[1]:
             raise Texture3dstException("Not enough space to paste image")
         
-        match self.header.format:
-            case 0 | 2 | 4: # rgba8 | rgba5551 | rgba4
-                new_image = image.convert("RGBA")
-            case 1 | 3: # rgb8 | rgb565
-                new_image = image.convert("RGB")
-            case 5 | 9: # la8 | la4
-                new_image = image.convert("LA")
-            case _:
-                raise ValueError("Texture 'format' value invalid")
+        new_image = image.convert(_getImageMode(self.header.format))
         
         for i in range(y, img_height):
             for j in range(x, img_width):
@@ -489,14 +734,14 @@ class Texture3dst:
                 copy_data[i].append(self.getPixel(j, i))
         return copy_data
     
-    def _formatPixelData(self) -> bytearray:
+    def _expandFullSize(self) -> None:
+        # Tiled textures always fit in their full size
+        if self.header.full_size[0] >= 8 and self.header.full_size[1] >= 8:
+            return
+        
         format_info = self._getFormatInfo(self.header.format)
         full_width = self.header.full_size[0]
         full_height = self.header.full_size[1]
-
-        # Rearrange pixels and saves them in data
-        rearranged_data = _createPixelDataStructure(full_width, full_height, format_info["pixel_lenght"])
-        # This is done to prevent miscalculations with real dimensions
         i = 0
         while i < self.header.full_size[1]:
             for j in range(self.header.full_size[0]):
@@ -505,47 +750,48 @@ class Texture3dst:
                     # Expands available slots
                     for k in range(full_height):
                         self.textureData.append([bytes(format_info["pixel_lenght"]) for _ in range(full_width)])
-                        rearranged_data.append([bytes(format_info["pixel_lenght"]) for _ in range(full_width)])
                     self.header.full_size[1] *= 2
                     full_height = self.header.full_size[1]
             i += 1
-        self.flipVertical()
-        for i in range(self.header.full_size[1]):
-            for j in range(self.header.full_size[0]):
-                dst_pos = _getTexturePosition(j, i, full_width)
-                rearranged_data[dst_pos[1]][dst_pos[0]] = self.textureData[i][j]
-            i += 1
-        data = _matrixToBytearray(rearranged_data)
+        return
+
+    def _writeLevel(self, fileBuffer: BinaryIO, pixel_bytes: numpy.ndarray) -> None:
+        height, width, length = pixel_bytes.shape
+
+        # Each row of 8x8 tiles is a contiguous block in the output, so it is
+        # rearranged and written on its own. Untiled levels are written at once
+        band_height = 8 if width >= 8 and height >= 8 else height
+        dst_pos = _getTexturePositionArray(width, band_height)
+        if dst_pos.max() >= width * band_height:
+            raise Texture3dstException(f"Level size can not be rearranged: {width}x{height}")
+        
+        band = numpy.zeros((width * band_height, length), dtype=numpy.uint8)
+        for band_y in range(0, height, band_height):
+            band[dst_pos] = pixel_bytes[band_y:band_y + band_height]
+            fileBuffer.write(band.tobytes())
+        return
+
+    def _writePixelData(self, fileBuffer: BinaryIO) -> None:
+        # Rows are read in reverse since textures are stored upside down
+        self._writeLevel(fileBuffer, self.textureData.toArray()[::-1])
 
         # In case of mipmaps
         if self.header.mip_level > 1:
-            self._processMipLevels(data)
-        self.flipVertical()
-        return data
+            self._writeMipLevels(fileBuffer)
+        return
 
-    def _processMipLevels(self, data: bytearray) -> None:
+    def _writeMipLevels(self, fileBuffer: BinaryIO) -> None:
         format_info = self._getFormatInfo(self.header.format)
-        width = self.header.full_size[0]
-        height = self.header.full_size[1]
-        resized_width = width
-        resized_height = height
-
-        match self.header.format:
-            case 0 | 2 | 4: # rgba8 | rgba5551 | rgba4
-                image_tmp = Image.new("RGBA", (width, height))
-            case 1 | 3: # rgb8 | rgb565
-                image_tmp = Image.new("RGB", (width, height))
-            case 5 | 9: # la8 | la4
-                image_tmp = Image.new("LA", (width, height))
-            case _:
-                raise ValueError("Texture 'format' value invalid")
-            
-        # Copy pixel data to a new image
-        image_tmp_data = image_tmp.load()
-        for i in range(0, height):
-            for j in range(0, width):
-                pixel_data = self.getPixel(j, i)
-                image_tmp_data[j, i] = pixel_data
+        resized_width = self.header.full_size[0]
+        resized_height = self.header.full_size[1]
+
+        # Copy pixel data upside down to a new image, decoding a few rows at a time
+        pixel_bytes = self.textureData.toArray()[::-1]
+        image_tmp_array = numpy.empty((resized_height, resized_width, format_info["pixel_channels"]), dtype=numpy.uint8)
+        for i in range(0, resized_height, 64):
+            image_tmp_array[i:i + 64] = _decodePixelArray(pixel_bytes[i:i + 64], self.header.format)
+        image_tmp = Image.fromarray(image_tmp_array)
+        del image_tmp_array
 
         for i in range(self.header.mip_level - 1):
             # Resizes image at half
@@ -553,45 +799,50 @@ class Texture3dst:
             resized_height = resized_height // 2
             image_tmp = image_tmp.resize((resized_width, resized_height), Image.Resampling.LANCZOS)
             
-            # Rearrange pixels and appends them to output
-            rearranged_data = _createPixelDataStructure(resized_width, resized_height, format_info["pixel_lenght"])
-            for j in range(resized_height):
-                for k in range(resized_width):
-                    dst_pos = _getTexturePosition(k, j, resized_width)
-                    rearranged_data[dst_pos[1]][dst_pos[0]] = self._convertPixelDataToBytes(image_tmp.getpixel((k, j)))
-            data.extend(_matrixToBytearray(rearranged_data))
+            # Converts pixels and writes them rearranged to output
+            self._writeLevel(fileBuffer, _encodePixelArray(numpy.asarray(image_tmp), self.header.format, format_info["pixel_lenght"]))
         return
 
-    def export(self, path: str | Path) -> None:
-        if not isinstance(path, str) and not isinstance(path, Path):
-            raise TypeError(genericTypeErrorMessage("path", path, Union[str, Path]))
+    def export(self, path: str | Path | BinaryIO) -> None:
+        if not isinstance(path, str) and not isinstance(path, Path) and not hasattr(path, "write"):
+            raise TypeError(genericTypeErrorMessage("path", path, Union[str, Path, BinaryIO]))
         
-        # Process pixel data
-        data = self._formatPixelData()
-
-        textureFileBuffer = open(path, "wb")
-
-        # Create header
-        ## File signature
-        textureFileBuffer.write(b'3DST')
-        ## Texture mode
-        write_uint32(textureFileBuffer, self.header.mode)
-        ## Texture format
-        write_uint32(textureFileBuffer, self.header.format)
+        # Full size must be final before writing the header
+        self._expandFullSize()
 
-        ## Texture real full size
-        write_uint32(textureFileBuffer, self.header.full_size[0])
-        write_uint32(textureFileBuffer, self.header.full_size[1])
-
-        ## Texture size
-        write_uint32(textureFileBuffer, self.size[0])
-        write_uint32(textureFileBuffer, self.size[1])
-
-        ### Mip level
-        write_uint32(textureFileBuffer, self.header.mip_level)
-
-        ## Writes all pixel data
-        textureFileBuffer.write(data)
-        
-        textureFileBuffer.close()
+        if hasattr(path, "write"):
+            textureFileBuffer = path
+        else:
+            textureFileBuffer = open(path, "wb")
+
+        try:
+            # Create header
+            ## File signature
+            textureFileBuffer.write(b'3DST')
+            ## Texture mode
+            write_uint32(textureFileBuffer, self.header.mode)
+            ## Texture format
+            write_uint32(textureFileBuffer, self.header.format)
+
+            ## Texture real full size
+            write_uint32(textureFileBuffer, self.header.full_size[0])
+            write_uint32(textureFileBuffer, self.header.full_size[1])
+
+            ## Texture size
+            write_uint32(textureFileBuffer, self.size[0])
+            write_uint32(textureFileBuffer, self.size[1])
+
+            ### Mip level
+            write_uint32(textureFileBuffer, self.header.mip_level)
+
+            ## Writes pixel data level by level
+            self._writePixelData(textureFileBuffer)
+        except BaseException:
+            # A partially written file isn't a valid texture
+            if textureFileBuffer is not path:
+                textureFileBuffer.close()
+                Path(path).unlink(missing_ok=True)
+            raise
+        if textureFileBuffer is not path:
+            textureFileBuffer.close()
         return
\ No newline at end of file
@@ -1,3 +1,5 @@
+from concurrent.futures import ProcessPoolExecutor
+
 def isPowerOfTwo(num: int) -> bool:
     """
     Returns if the number is a power of two.
@@ -21,4 +23,18 @@ def maxIntBits(n: int) -> int:
         raise ValueError("n must be a positive integer")
     
     max_num = (2 ** n) - 1
-    return max_num
\ No newline at end of file
+    return max_num
+
+def parallelMap(function, iterable, jobs: int = None) -> list:
+    """
+    Applies the function to every item of the iterable using a pool of processes and returns the results in order.
+    If jobs is 1, or there is at most one item, the items are processed in the current process.
+    """
+    if jobs != None and jobs <= 0:
+        raise ValueError("jobs must be a positive integer")
+    
+    items = list(iterable)
+    if jobs == 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(function, items, chunksize=8))
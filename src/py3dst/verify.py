@@ -0,0 +1,91 @@
+import hashlib
+import os
+from functools import partial
+from pathlib import Path
+from typing import List, Union
+
+from .tex3dst import Texture3dst, _headerTexture3dst, _readTexture3dstHeader
+from .utils import parallelMap
+from .error_classes import *
+
+_HEADER_SIZE = 32 # Signature plus 7 uint32 fields
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+def verify(path: str | Path, hash_name: str = None) -> dict:
+    """
+    Checks the signature, header and payload size of a 3DST file without decoding its pixels.
+    If hash_name is provided, the payload is also hashed with that hashlib algorithm.
+    Returns a report that can be serialized as JSON.
+    """
+    if not isinstance(path, str) and not isinstance(path, Path):
+        raise TypeError(genericTypeErrorMessage("path", path, Union[str, Path]))
+    if hash_name != None:
+        if not isinstance(hash_name, str):
+            raise TypeError(genericTypeErrorMessage("hash_name", hash_name, str))
+        if hash_name not in hashlib.algorithms_available:
+            raise ValueError(f"Hash algorithm unavailable: {hash_name}")
+        # Variable length digests like shake_128 need a length to be hashed
+        if hashlib.new(hash_name).digest_size == 0:
+            raise ValueError(f"Hash algorithm has no fixed digest size: {hash_name}")
+
+    report = {
+        "path": str(path),
+        "valid": False,
+        "error": None,
+        "error_type": None,
+        "format": None,
+        "size": None,
+        "full_size": None,
+        "mip_level": None,
+        "file_size": None,
+        "expected_size": None,
+        "hash": None
+    }
+    try:
+        file_size = os.path.getsize(path)
+        report["file_size"] = file_size
+
+        with open(path, "rb") as textureFileBuffer:
+            # File signature
+            if textureFileBuffer.read(4) != b'3DST':
+                raise Texture3dstNoSignature()
+            if file_size < _HEADER_SIZE:
+                raise Texture3dstUnexpectedEndOfFile()
+
+            # Header of the file, checked with the same rules as open()
+            texture = Texture3dst()
+            texture.header = _headerTexture3dst()
+            _readTexture3dstHeader(textureFileBuffer, texture.header)
+            report["format"] = texture.header.format
+            report["size"] = list(texture.header.size)
+            report["full_size"] = list(texture.header.full_size)
+            report["mip_level"] = texture.header.mip_level
+            texture._validateHeader()
+            report["format"] = texture._getFormatInfo(texture.header.format)["name"]
+
+            # Base level plus mip levels must fill the file exactly
+            expected_size = _HEADER_SIZE + texture._getPayloadSize()
+            report["expected_size"] = expected_size
+            if file_size < expected_size:
+                raise Texture3dstUnexpectedEndOfFile()
+            elif file_size > expected_size:
+                raise Texture3dstException(f"Unexpected data after end of texture: {file_size - expected_size} bytes")
+
+            if hash_name != None:
+                payload_hash = hashlib.new(hash_name)
+                chunk = textureFileBuffer.read(_HASH_CHUNK_SIZE)
+                while chunk:
+                    payload_hash.update(chunk)
+                    chunk = textureFileBuffer.read(_HASH_CHUNK_SIZE)
+                report["hash"] = f"{hash_name}:{payload_hash.hexdigest()}"
+        report["valid"] = True
+    except (Texture3dstException, ValueError, OSError) as e:
+        report["error"] = str(e)
+        report["error_type"] = type(e).__name__
+    return report
+
+def verifyFiles(paths: List[str | Path], hash_name: str = None, jobs: int = None) -> List[dict]:
+    """
+    Verifies every file in parallel and returns their reports in the same order.
+    """
+    return parallelMap(partial(verify, hash_name=hash_name), paths, jobs)